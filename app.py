@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 import time
 from machine import Machine  # Import our simulation class
+from formatting import format_metric_labels
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -13,25 +14,85 @@ st.set_page_config(
     layout="wide"
 )
 
+# --- History Buffer ---
+HISTORY_LENGTH = 100  # Number of samples kept for the history chart
+
+def reset_history():
+    """
+    Preallocates fixed-size ring buffers for the sensor history.
+    Each tick writes into these in place instead of growing a DataFrame.
+    """
+    st.session_state.buf_time = np.empty(HISTORY_LENGTH, dtype=np.int64)  # Epoch ns
+    st.session_state.buf_temp = np.empty(HISTORY_LENGTH, dtype=np.float32)
+    st.session_state.buf_volt = np.empty(HISTORY_LENGTH, dtype=np.float32)
+    st.session_state.buf_speed = np.empty(HISTORY_LENGTH, dtype=np.float32)
+    st.session_state.buf_idx = 0    # Next write position
+    st.session_state.buf_count = 0  # Number of valid samples
+
+def record_sample(status):
+    """Stores one sensor reading at the ring buffer's write cursor."""
+    idx = st.session_state.buf_idx
+    st.session_state.buf_time[idx] = time.time_ns()
+    st.session_state.buf_temp[idx] = status.temperature
+    st.session_state.buf_volt[idx] = status.voltage
+    st.session_state.buf_speed[idx] = status.speed
+    st.session_state.buf_idx = (idx + 1) % HISTORY_LENGTH
+    st.session_state.buf_count = min(st.session_state.buf_count + 1, HISTORY_LENGTH)
+
+def get_history_order():
+    """
+    Returns an index selecting the buffered samples in chronological order.
+    """
+    count = st.session_state.buf_count
+    if count < HISTORY_LENGTH:
+        # Not wrapped yet: samples are already in order, so use views
+        return slice(0, count)
+    # Wrapped: the oldest sample sits at the write cursor
+    return np.arange(st.session_state.buf_idx,
+                     st.session_state.buf_idx + HISTORY_LENGTH) % HISTORY_LENGTH
+
+def get_chart_frame():
+    """
+    Builds the long-form (time, Sensor, Value) frame for the history chart
+    directly from the ring buffers, so no melt is needed per tick.
+    """
+    order = get_history_order()
+    times = st.session_state.buf_time[order]
+
+    return pd.DataFrame({
+        # Raw timestamps are converted in one batch, only when rendering
+        'time': pd.to_datetime(np.tile(times, 2), unit='ns', utc=True),
+        # Compact dtypes: int8 category codes and the buffers' float32 values
+        'Sensor': pd.Categorical.from_codes(
+            np.repeat(np.arange(2, dtype=np.int8), len(times)),
+            categories=['temperature', 'speed']
+        ),
+        'Value': np.concatenate((
+            st.session_state.buf_temp[order],
+            st.session_state.buf_speed[order]
+        ))
+    }, copy=False)
+
 # --- Initialize Session State ---
+# Each browser session operates its own machine, like a single HMI station
 if 'machine' not in st.session_state:
     st.session_state.machine = Machine()
     print("Initialized Machine object in session state.")
 
-if 'data' not in st.session_state:
-    st.session_state.data = pd.DataFrame(columns=['time', 'temperature', 'voltage', 'speed'])
+if 'buf_idx' not in st.session_state:
+    reset_history()
 
 # --- Helper Functions ---
-def get_status_indicator_html(state):
+def _build_status_indicator_html(state):
     """
     Generates a custom HTML/CSS block for a large, color-coded
     state indicator based on HMI best practices.
     """
     color_map = {
-        Machine.STATE_ACTIVE: "#28a745",  # Green
-        Machine.STATE_OVERHEATING: "#dc3545", # Red
-        Machine.STATE_RECOVERY: "#ffc107",  # Yellow
-        Machine.STATE_IDLE: "#6c757d"   # Grey
+        Machine.STATE_ACTIVE.name: "#28a745",  # Green
+        Machine.STATE_OVERHEATING.name: "#dc3545", # Red
+        Machine.STATE_RECOVERY.name: "#ffc107",  # Yellow
+        Machine.STATE_IDLE.name: "#6c757d"   # Grey
     }
     color = color_map.get(state, "#6c757d") # Default to Grey
     
@@ -50,123 +111,111 @@ def get_status_indicator_html(state):
     """
     return indicator_html
 
+# One block per machine state, built once when the script loads
+_STATUS_INDICATOR_HTML = {
+    state.name: _build_status_indicator_html(state.name)
+    for state in (Machine.STATE_IDLE, Machine.STATE_ACTIVE,
+                  Machine.STATE_OVERHEATING, Machine.STATE_RECOVERY)
+}
+
+def get_status_indicator_html(state):
+    """Returns the precomputed state indicator block for a state name."""
+    return _STATUS_INDICATOR_HTML.get(state) or _build_status_indicator_html(state)
+
 # --- Dashboard Interface ---
 st.title("🤖 Virtual Control Panel – Interactive Machine Dashboard")
 st.markdown("A simulation of an industrial HMI for real-time monitoring and control.")
 
-# --- Layout Containers ---
-header = st.container()
-controls = st.container()
-metrics = st.container()
-charts = st.container()
-
-# --- Control Panel (Moved up for better flow) ---
-with controls:
+# --- Control Panel (Sidebar) ---
+# Kept outside the live fragment so the controls are only rendered on
+# a full rerun (i.e. when the operator presses a button).
+with st.sidebar:
     st.subheader("Control Panel")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("START Machine"): # 'type' auto-set by theme
-            st.session_state.machine.toggle_start()
-            
-    with col2:
-        if st.button("STOP Machine"):
-            st.session_state.machine.toggle_stop()
-            
-    with col3:
-        if st.button("Reset Simulation"):
-            st.session_state.machine = Machine()
-            st.session_state.data = pd.DataFrame(columns=['time', 'temperature', 'voltage', 'speed'])
-            st.success("Simulation reset to initial state.")
-
-# --- Header & Status (Placeholders) ---
-with header:
-    st.header("System Status")
-    # This 'status_placeholder' will be updated in real-time
-    status_placeholder = st.empty()
 
-# --- Live Metrics (Placeholders) ---
-with metrics:
-    st.subheader("Live Sensor Data")
-    m_col1, m_col2, m_col3 = st.columns(3)
-    temp_metric = m_col1.empty()
-    voltage_metric = m_col2.empty()
-    speed_metric = m_col3.empty()
+    if st.button("START Machine"): # 'type' auto-set by theme
+        st.session_state.machine.toggle_start()
 
-# --- Live Charts (Placeholder) ---
-with charts:
-    st.subheader("Sensor Data History")
-    chart_placeholder = st.empty()
+    if st.button("STOP Machine"):
+        st.session_state.machine.toggle_stop()
 
-# --- Main Simulation Loop ---
-while True:
+    if st.button("Reset Simulation"):
+        st.session_state.machine = Machine()
+        reset_history()
+        st.success("Simulation reset to initial state.")
+
+# --- Live Dashboard ---
+@st.fragment(run_every=1.0)
+def live_dashboard():
+    """
+    One simulation tick. Streamlit reruns only this fragment every
+    second, instead of looping over the whole script.
+    """
     # 1. Update the machine state
-    st.session_state.machine.update()
-    status = st.session_state.machine.get_status()
+    machine = st.session_state.machine
+    machine.update()
+    status = machine.get_status()
 
     # 2. Update historical data
-    new_data = pd.DataFrame({
-        'time': [pd.Timestamp.now()],
-        'temperature': [status['temperature']],
-        'voltage': [status['voltage']],
-        'speed': [status['speed']]
-    })
-    st.session_state.data = pd.concat([st.session_state.data, new_data], ignore_index=True)
-    st.session_state.data = st.session_state.data.tail(100)
+    record_sample(status)
 
     # 3. Update Status Header (NOW WITH COLOR!)
-    with status_placeholder.container():
-        # Display the new HTML indicator
-        st.markdown(get_status_indicator_html(status['state']), unsafe_allow_html=True)
-        # Display the text message
-        st.info(f"**Message:** {status['state_message']}")
-        # st.markdown(f"**Running:** {'YES' if status['running'] else 'NO'}")
+    st.header("System Status")
+    # Display the new HTML indicator
+    st.markdown(get_status_indicator_html(status.state), unsafe_allow_html=True)
+    # Display the text message
+    st.info(f"**Message:** {status.state_message}")
+    # st.markdown(f"**Running:** {'YES' if status.running else 'NO'}")
 
     # 4. Update Metrics
-    # (Calculate deltas based on current state to be more intelligent)
-    temp_delta = status['temperature'] - Machine.AMBIENT_TEMP
-    
-    if status['state'] == Machine.STATE_ACTIVE:
-        volt_delta = status['voltage'] - 240
-        speed_delta = status['speed'] - 1500
-    else:
-        volt_delta = status['voltage']
-        speed_delta = status['speed']
-
-    temp_metric.metric(
+    temp_labels, volt_labels, speed_labels = format_metric_labels(
+        round(status.temperature, 1),
+        round(status.voltage, 1),
+        round(status.speed),
+        status.state
+    )
+
+    st.subheader("Live Sensor Data")
+    m_col1, m_col2, m_col3 = st.columns(3)
+
+    m_col1.metric(
         label="Temperature", 
-        value=f"{status['temperature']:.1f} °C",
-        delta=f"{temp_delta:.1f} °C vs. Ambient",
-        delta_color="inverse" if status['state'] == Machine.STATE_OVERHEATING else "normal"
+        value=temp_labels[0],
+        delta=temp_labels[1],
+        delta_color="inverse" if status.state == Machine.STATE_OVERHEATING.name else "normal"
     )
     
-    voltage_metric.metric(
+    m_col2.metric(
         label="Voltage", 
-        value=f"{status['voltage']:.1f} V", 
-        delta=f"{volt_delta:.1f} V vs. Nominal (240V)"
+        value=volt_labels[0], 
+        delta=volt_labels[1]
     )
     
-    speed_metric.metric(
+    m_col3.metric(
         label="Motor Speed", 
-        value=f"{status['speed']:.0f} RPM",
-        delta=f"{speed_delta:.0f} RPM vs. Nominal (1500 RPM)"
+        value=speed_labels[0],
+        delta=speed_labels[1]
     )
 
     # 5. Update Charts
-    with chart_placeholder.container():
-        chart_data = st.session_state.data.melt(
-            'time', 
-            var_name='Sensor', 
-            value_name='Value',
-            value_vars=['temperature', 'speed']
-        )
-        
-        st.line_chart(
-            chart_data,
-            x='time',
-            y='Value',
-            color='Sensor'
-        )
-
-    # 6. Wait for the next tick
-    time.sleep(1.0)
\ No newline at end of file
+    st.subheader("Sensor Data History")
+    st.line_chart(
+        get_chart_frame(),
+        x='time',
+        y='Value',
+        color='Sensor'
+    )
+
+    # 6. Diagnostics (opt-in: open the app with ?debug=1)
+    # Drawn inside the fragment so the numbers refresh every tick.
+    if st.query_params.get("debug") == "1":
+        with st.expander("Cache stats"):
+            st.json({
+                "format_metric_labels": format_metric_labels.cache_info()._asdict(),
+                "history_samples": st.session_state.buf_count,
+                "history_buffer_bytes": sum(
+                    st.session_state[key].nbytes
+                    for key in ('buf_time', 'buf_temp', 'buf_volt', 'buf_speed')
+                )
+            })
+
+live_dashboard()
@@ -0,0 +1,29 @@
+# formatting.py
+
+from functools import lru_cache
+from machine import Machine
+
+# Lives outside app.py so the cache survives Streamlit script reruns
+@lru_cache(maxsize=256)
+def format_metric_labels(temperature, voltage, speed, state):
+    """
+    Formats the (value, delta) label pairs for the three sensor metrics.
+    Callers round the readings to display precision first. This mainly
+    pays off while the machine idles at ambient temperature; while ACTIVE
+    the temperature keeps rising, so most keys are new.
+    """
+    # (Calculate deltas based on current state to be more intelligent)
+    temp_delta = temperature - Machine.AMBIENT_TEMP
+
+    if state == Machine.STATE_ACTIVE.name:
+        volt_delta = voltage - 240
+        speed_delta = speed - 1500
+    else:
+        volt_delta = voltage
+        speed_delta = speed
+
+    return (
+        (f"{temperature:.1f} °C", f"{temp_delta:.1f} °C vs. Ambient"),
+        (f"{voltage:.1f} V", f"{volt_delta:.1f} V vs. Nominal (240V)"),
+        (f"{speed:.0f} RPM", f"{speed_delta:.0f} RPM vs. Nominal (1500 RPM)")
+    )
@@ -1,6 +1,21 @@
 # machine.py
 
 import numpy as np
+from collections import namedtuple
+from enum import IntEnum
+
+class State(IntEnum):
+    """The machine's Finite State Machine (FSM) states."""
+    IDLE = 0
+    ACTIVE = 1
+    OVERHEATING = 2
+    RECOVERY = 3
+
+# Snapshot of the machine returned by Machine.get_status()
+MachineStatus = namedtuple(
+    "MachineStatus",
+    "state running temperature voltage speed state_message"
+)
 
 class Machine:
     """
@@ -8,17 +23,30 @@ class Machine:
     and sensor readings.
     """
 
+    # Fixed instance attributes (no per-instance __dict__)
+    __slots__ = (
+        "state", "running",
+        "temperature", "voltage", "speed",
+        "state_message", "overheat_counter",
+        "_transitions",
+        "_rng", "_normal_pool", "_normal_index", "_uniform_pool", "_uniform_index"
+    )
+
     # Define state constants
-    STATE_IDLE = "IDLE"
-    STATE_ACTIVE = "ACTIVE"
-    STATE_OVERHEATING = "OVERHEATING"
-    STATE_RECOVERY = "RECOVERY"
+    STATE_IDLE = State.IDLE
+    STATE_ACTIVE = State.ACTIVE
+    STATE_OVERHEATING = State.OVERHEATING
+    STATE_RECOVERY = State.RECOVERY
+
+    # String names reported by get_status(), indexed by state
+    _STATE_NAMES = tuple(state.name for state in State)
 
     # Simulation constants
     AMBIENT_TEMP = 25.0
     TEMP_THRESHOLD_HIGH = 80.0
     TEMP_THRESHOLD_LOW = 40.0
     OVERHEAT_TICKS_LIMIT = 5
+    RNG_POOL_SIZE = 4096  # Random draws generated per batch
 
     def __init__(self):
         # Initial state
@@ -34,6 +62,19 @@ class Machine:
         self.state_message = "System is idle. Ready to start."
         self.overheat_counter = 0
 
+        # FSM transition handlers, one per state
+        self._transitions = {
+            self.STATE_IDLE: self._transition_from_idle,
+            self.STATE_ACTIVE: self._transition_from_active,
+            self.STATE_OVERHEATING: self._transition_from_overheating,
+            self.STATE_RECOVERY: self._transition_from_recovery
+        }
+
+        # Random number generation (draws are pre-generated in batches)
+        self._rng = np.random.default_rng()
+        self._refill_normal_pool()
+        self._refill_uniform_pool()
+
     def toggle_start(self):
         """User requests to start the machine."""
         if self.state == self.STATE_IDLE:
@@ -45,85 +86,117 @@ class Machine:
         self.running = False
         print("User requested STOP")
 
+    def _refill_normal_pool(self):
+        """Private method to pre-generate a batch of standard normal draws."""
+        # Stored as a list so each draw is a plain float, not a NumPy scalar
+        self._normal_pool = self._rng.standard_normal(self.RNG_POOL_SIZE).tolist()
+        self._normal_index = 0
+
+    def _refill_uniform_pool(self):
+        """Private method to pre-generate a batch of [0, 1) uniform draws."""
+        self._uniform_pool = self._rng.random(self.RNG_POOL_SIZE).tolist()
+        self._uniform_index = 0
+
+    def _normal(self, mean, std):
+        """Private method returning one normal draw from the pool."""
+        if self._normal_index >= self.RNG_POOL_SIZE:
+            self._refill_normal_pool()
+        value = self._normal_pool[self._normal_index]
+        self._normal_index += 1
+        return mean + std * value
+
+    def _uniform(self, low, high):
+        """Private method returning one uniform draw from the pool."""
+        if self._uniform_index >= self.RNG_POOL_SIZE:
+            self._refill_uniform_pool()
+        value = self._uniform_pool[self._uniform_index]
+        self._uniform_index += 1
+        return low + (high - low) * value
+
     def _update_sensors(self):
         """
         Private method to simulate sensor data based on the current state.
-        Uses numpy.random for realistic drift.
+        Uses pooled numpy.random draws for realistic drift.
         """
         if self.state == self.STATE_ACTIVE:
-            self.speed = np.random.normal(1500, 5)  # Nominal 1500 RPM
-            self.voltage = np.random.normal(240, 0.5) # Nominal 240 V
+            self.speed = self._normal(1500, 5)  # Nominal 1500 RPM
+            self.voltage = self._normal(240, 0.5) # Nominal 240 V
             # Temperature rises when active
-            self.temperature += np.random.uniform(0.5, 1.5)
+            self.temperature += self._uniform(0.5, 1.5)
 
         elif self.state == self.STATE_OVERHEATING:
             # Speed becomes erratic, voltage fluctuates
-            self.speed = np.random.normal(1550, 20) 
-            self.voltage = np.random.normal(240, 2)
+            self.speed = self._normal(1550, 20) 
+            self.voltage = self._normal(240, 2)
             # Temperature continues to rise slightly
-            self.temperature += np.random.uniform(0.1, 0.5)
+            self.temperature += self._uniform(0.1, 0.5)
             
         elif self.state == self.STATE_RECOVERY:
             # Load is reduced, speed drops
-            self.speed = np.random.normal(300, 3) 
-            self.voltage = np.random.normal(242, 0.2) # Stabilizing
+            self.speed = self._normal(300, 3) 
+            self.voltage = self._normal(242, 0.2) # Stabilizing
             # Temperature cools down actively
-            self.temperature -= np.random.uniform(1.0, 2.0)
+            self.temperature -= self._uniform(1.0, 2.0)
 
         elif self.state == self.STATE_IDLE:
             self.speed = 0.0
             self.voltage = 0.0
             # Cools down passively to ambient
             if self.temperature > self.AMBIENT_TEMP:
-                self.temperature -= np.random.uniform(0.2, 0.5)
+                self.temperature -= self._uniform(0.2, 0.5)
             else:
                 self.temperature = self.AMBIENT_TEMP
 
+    def _transition_from_idle(self):
+        """Private FSM handler for the IDLE state."""
+        if self.running:
+            # Transition: IDLE -> ACTIVE
+            self.state = self.STATE_ACTIVE
+            self.state_message = "System active and stable."
+
+    def _transition_from_active(self):
+        """Private FSM handler for the ACTIVE state."""
+        if not self.running:
+            # Transition: ACTIVE -> IDLE
+            self.state = self.STATE_IDLE
+            self.state_message = "System shutting down."
+        elif self.temperature > self.TEMP_THRESHOLD_HIGH:
+            # Transition: ACTIVE -> OVERHEATING
+            self.state = self.STATE_OVERHEATING
+            self.state_message = "CRITICAL: Overheating detected! High temp."
+            self.overheat_counter = 0
+
+    def _transition_from_overheating(self):
+        """Private FSM handler for the OVERHEATING state."""
+        if not self.running:
+            # Transition: OVERHEATING -> IDLE (Emergency Stop)
+            self.state = self.STATE_IDLE
+            self.state_message = "Emergency stop initiated."
+        elif self.overheat_counter > self.OVERHEAT_TICKS_LIMIT:
+            # Transition: OVERHEATING -> RECOVERY
+            self.state = self.STATE_RECOVERY
+            self.state_message = "System in recovery mode. Reducing load."
+        else:
+            self.overheat_counter += 1
+
+    def _transition_from_recovery(self):
+        """Private FSM handler for the RECOVERY state."""
+        if not self.running:
+            # Transition: RECOVERY -> IDLE
+            self.state = self.STATE_IDLE
+            self.state_message = "Shutdown during recovery."
+        elif self.temperature < self.TEMP_THRESHOLD_LOW:
+            # Transition: RECOVERY -> IDLE (Cooled down)
+            self.state = self.STATE_IDLE
+            self.running = False  # Force stop after recovery
+            self.state_message = "Recovery complete. System idle. Ready for restart."
+
     def _simulate_state_transitions(self):
         """
         Private method to manage the Finite State Machine (FSM) logic.
+        Dispatches to the transition handler for the current state.
         """
-        current_state = self.state
-
-        if current_state == self.STATE_IDLE:
-            if self.running:
-                # Transition: IDLE -> ACTIVE
-                self.state = self.STATE_ACTIVE
-                self.state_message = "System active and stable."
-        
-        elif current_state == self.STATE_ACTIVE:
-            if not self.running:
-                # Transition: ACTIVE -> IDLE
-                self.state = self.STATE_IDLE
-                self.state_message = "System shutting down."
-            elif self.temperature > self.TEMP_THRESHOLD_HIGH:
-                # Transition: ACTIVE -> OVERHEATING
-                self.state = self.STATE_OVERHEATING
-                self.state_message = "CRITICAL: Overheating detected! High temp."
-                self.overheat_counter = 0
-
-        elif current_state == self.STATE_OVERHEATING:
-            if not self.running:
-                # Transition: OVERHEATING -> IDLE (Emergency Stop)
-                self.state = self.STATE_IDLE
-                self.state_message = "Emergency stop initiated."
-            elif self.overheat_counter > self.OVERHEAT_TICKS_LIMIT:
-                # Transition: OVERHEATING -> RECOVERY
-                self.state = self.STATE_RECOVERY
-                self.state_message = "System in recovery mode. Reducing load."
-            else:
-                self.overheat_counter += 1
-
-        elif current_state == self.STATE_RECOVERY:
-            if not self.running:
-                # Transition: RECOVERY -> IDLE
-                self.state = self.STATE_IDLE
-                self.state_message = "Shutdown during recovery."
-            elif self.temperature < self.TEMP_THRESHOLD_LOW:
-                # Transition: RECOVERY -> IDLE (Cooled down)
-                self.state = self.STATE_IDLE
-                self.running = False  # Force stop after recovery
-                self.state_message = "Recovery complete. System idle. Ready for restart."
+        self._transitions[self.state]()
 
     def update(self):
         """
@@ -138,17 +211,17 @@ class Machine:
 
     def get_status(self):
         """
-        Returns a dictionary of the machine's current state and data
-        for the dashboard to consume.
+        Returns a MachineStatus snapshot of the machine's current state
+        and data for the dashboard to consume.
         """
-        return {
-            "state": self.state,
-            "running": self.running,
-            "temperature": self.temperature,
-            "voltage": self.voltage,
-            "speed": self.speed,
-            "state_message": self.state_message
-        }
+        return MachineStatus(
+            self._STATE_NAMES[self.state],
+            self.running,
+            self.temperature,
+            self.voltage,
+            self.speed,
+            self.state_message
+        )
 
 if __name__ == "__main__":
     # Example of how to use the class